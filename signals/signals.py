@@ -1,5 +1,135 @@
 import pandas as pd
 import numpy as np
+from numba import njit, prange
+
+@njit(cache=True, nogil=True)
+def _ewm_mean(x, alpha):
+
+    '''
+    Exponentially weighted mean (pandas `adjust=True`), compiled with numba
+    -Takes a float64 array and the decay rate ("alpha")
+    -Returns a float64 array with the running weighted mean; NaN inputs are skipped but still decay the older weights
+    '''
+
+    out = np.empty(len(x))
+    num = 0.0
+    den = 0.0
+
+    for i in range(len(x)):
+        if x[i] == x[i]:
+            num = (num * (1 - alpha)) + x[i]
+            den = (den * (1 - alpha)) + 1
+        elif den > 0:
+            num = num * (1 - alpha)
+            den = den * (1 - alpha)
+        out[i] = num / den if den > 0 else np.nan
+
+    return out
+
+def _check_span(span, name):
+
+    '''
+    Span validation for the compiled smoothing kernels (the same rule pandas `ewm(span=...)` enforces)
+    -Takes the span value and the name of the argument it came from
+    -Raises a ValueError unless the span is a number of 1 or greater
+    '''
+
+    if isinstance(span, bool) or not isinstance(span, (int, float, np.integer, np.floating)) or not span >= 1:
+        raise ValueError(f'{name} must be a number of 1 or greater, got {span!r}')
+
+def _ewm(values, span):
+
+    '''
+    Equivalent of `series.ewm(span=span).mean()` backed by `_ewm_mean`
+    -Takes a Series or array and the EWMA window ("span")
+    -Returns a float64 numpy array
+    -Raises a ValueError if "span" is less than 1
+    '''
+
+    _check_span(span, 'span')
+    return _ewm_mean(np.asarray(values, dtype=np.float64), 2 / (span + 1))
+
+@njit(cache=True, nogil=True)
+def _ewm_mean_multi(x, alphas):
+
+    '''
+    Several exponentially weighted means (pandas `adjust=True`) over the same array in one pass, compiled with numba
+    -Takes a float64 array and a float64 array of decay rates ("alphas")
+    -Returns a 2D float64 array where column k is the same as `_ewm_mean(x, alphas[k])`
+    '''
+
+    n_alphas = len(alphas)
+    out = np.empty((len(x), n_alphas))
+    num = np.zeros(n_alphas)
+    den = np.zeros(n_alphas)
+
+    for i in range(len(x)):
+        for k in range(n_alphas):
+            if x[i] == x[i]:
+                num[k] = (num[k] * (1 - alphas[k])) + x[i]
+                den[k] = (den[k] * (1 - alphas[k])) + 1
+            elif den[k] > 0:
+                num[k] = num[k] * (1 - alphas[k])
+                den[k] = den[k] * (1 - alphas[k])
+            out[i, k] = num[k] / den[k] if den[k] > 0 else np.nan
+
+    return out
+
+def _ewm_multi(values, spans):
+
+    '''
+    Equivalent of `[series.ewm(span=span).mean() for span in spans]` backed by `_ewm_mean_multi`
+    -Takes a Series or array and the EWMA windows ("spans")
+    -Returns a 2D float64 numpy array with one column per span
+    -Raises a ValueError if any span is less than 1
+    '''
+
+    for span in spans:
+        _check_span(span, 'span')
+
+    alphas = 2 / (np.asarray(spans, dtype=np.float64) + 1)
+    return _ewm_mean_multi(np.asarray(values, dtype=np.float64), alphas)
+
+@njit(cache=True, nogil=True)
+def _sma(x, window):
+
+    '''
+    Simple moving average with a running sum, compiled with numba
+    -Takes a float64 array and the moving average window ("window")
+    -Returns a float64 array that is NaN until a full window is available (or while a NaN is inside the window), like `rolling(window).mean()`
+    '''
+
+    n = len(x)
+    out = np.empty(n)
+    total = 0.0
+    nan_count = 0
+
+    for i in range(n):
+        # add the newest value to the window
+        if x[i] == x[i]:
+            total += x[i]
+        else:
+            nan_count += 1
+        # drop the value that just fell out of the window
+        if i >= window:
+            if x[i-window] == x[i-window]:
+                total -= x[i-window]
+            else:
+                nan_count -= 1
+        out[i] = total / window if (i >= window - 1 and nan_count == 0) else np.nan
+
+    return out
+
+def _check_window(window, name):
+
+    '''
+    Window validation for the compiled kernels, which do not bounds-check their inputs
+    -Takes the window value and the name of the argument it came from
+    -Raises a ValueError unless the window is an integer of 1 or greater
+    '''
+
+    if isinstance(window, bool) or not isinstance(window, (int, np.integer)) or window < 1:
+        raise ValueError(f'{name} must be an integer of 1 or greater, got {window!r}')
 
 def ewma_crossover(data, period_fast=9, period_slow=13):
 
@@ -9,6 +139,8 @@ def ewma_crossover(data, period_fast=9, period_slow=13):
         *Optionally, takes the faster moving average window size ("period_fast"; default = 9)
         *Optionally, takes the slower moving average window size ("period_slow"; default = 13)
     -Returns a dataframe with 'close', 'fast_ewma', 'slow_ewma', 'ewma_diff', and 'signal'
+        *'signal' is int8: -1 (bearish) or 1 (bullish)
+    -Raises a ValueError if "period_fast" is not smaller than "period_slow"
     '''
 
     # build out an exponential moving average crossover signal generator
@@ -16,28 +148,29 @@ def ewma_crossover(data, period_fast=9, period_slow=13):
     
     # Check to make sure the fast EWMA is smaller than the slow EWMA
     if period_fast >= period_slow:
-        return f'The fast EWMA signal (period_fast={period_fast}) is larger than or equal to the slow EWMA signal (period_slow={period_slow}).  The fast EWMA signal needs to be smaller than the slow EWMA signal.'
+        raise ValueError(f'The fast EWMA signal (period_fast={period_fast}) is larger than or equal to the slow EWMA signal (period_slow={period_slow}).  The fast EWMA signal needs to be smaller than the slow EWMA signal.')
+
+    # pull the closing prices out of the dataframe once as a float64 array
+    close = data['Close'].to_numpy(dtype=np.float64)
 
-    # EWMA Fast
-    ewma_fast = data.Close.ewm(span=period_fast).mean()
+    # EWMA Fast and EWMA Slow, both computed in a single pass over the closing prices
+    ewmas = _ewm_multi(close, (period_fast, period_slow))
+    ewma_fast = ewmas[:, 0]
+    ewma_slow = ewmas[:, 1]
 
-    # EWMA Slow
-    ewma_slow = data.Close.ewm(span=period_slow).mean()
+    ewma_diff = ewma_fast - ewma_slow
 
     # Create a dataframe that consolidates and generates signal data
     # the signal column of the dataframe will be binary: 0 = bearish, 1 = bullish
         # -1 is bearish in the condition that the fast ewma is below or equal to the slow ewma
         # 1 is bullish in the condiditon that the fast ewma is above the slow ewma
     cross_over_df = pd.DataFrame(
-        {
-        'close': data.Close, 
-        'fast_ewma': ewma_fast, 
-        'slow_ewma': ewma_slow, 
-        'ewma_diff': ewma_fast - ewma_slow
-        }
+        np.column_stack([close, ewma_fast, ewma_slow, ewma_diff]),
+        index=data.index,
+        columns=['close', 'fast_ewma', 'slow_ewma', 'ewma_diff']
         )
 
-    cross_over_df['signal'] = cross_over_df.ewma_diff.apply(lambda x: 1 if x > 0 else -1)
+    cross_over_df['signal'] = np.where(ewma_diff > 0, 1, -1).astype(np.int8)
 
     return cross_over_df
 
@@ -47,24 +180,25 @@ def ewma(data, period):
     'Exponential Weighted Moving Average'
     -Takes in a dataframe with at least one column 'Close' and a datetime as the index AND a moving average window
     -Returns a dataframe with 'close', 'ewma', 'ewma_diff', and 'signal'
+        *'signal' is int8: -1 (bearish) or 1 (bullish)
     '''
 
     # build out an exponential moving average
-    ewma = data.Close.ewm(span=period).mean()
+    close = data['Close'].to_numpy(dtype=np.float64)
+    ewma = _ewm(close, period)
+    ewma_diff = close - ewma
 
     # Create a dataframe that consolidates and generates signal data
     # the signal column of the dataframe will be binary: 0 = bearish, 1 = bullish
         # -1 is bearish in the condition that the signal is above the closing price
         # 1 is bullish in the condiditon that the signal is below the closing price
     ewma_df = pd.DataFrame(
-        {
-        'close': data.Close, 
-        'ewma': ewma,
-        'ewma_diff': data.Close - ewma
-        }
+        np.column_stack([close, ewma, ewma_diff]),
+        index=data.index,
+        columns=['close', 'ewma', 'ewma_diff']
         )
 
-    ewma_df['signal'] = ewma_df.ewma_diff.apply(lambda x: 1 if x > 0 else -1)
+    ewma_df['signal'] = np.where(ewma_diff > 0, 1, -1).astype(np.int8)
 
     return ewma_df
 
@@ -76,38 +210,41 @@ def b_band(data, bb_period=20, std_dev=2):
         *Optionally, takes the moving average window size ("bb_period"; default = 20)
         *Optionally, takes the number of standard deviations away from the moving averge to create the bands ("std_dev"; default = 2)
     -Returns a dataframe with 'close', 'middle_band', 'upper_band', 'lower_band', 'band_delta', 'delta_ewma', 'band_signal', and 'signal'
+        *'signal' is int8: -1 (high volatility) or 1 (volatility incoming)
+    -Raises a ValueError if "bb_period" is not an integer of 1 or greater
     '''
 
     # Need 3 lines for Bollinger Bands:
         # Middle = simple moving average
         # Upper and lower = standard deviation of moving average
     # MA is typically set as 20 periods and the upper and lower bands are typically set as 2 std
-    bb_mid = data.Close.rolling(window=bb_period).mean()
+    _check_window(bb_period, 'bb_period')
+    close = data['Close'].to_numpy(dtype=np.float64)
+    bb_mid = _sma(close, bb_period)
 
-    bb_upper = bb_mid + (std_dev * data.Close.ewm(span=bb_period).std())
-    bb_lower = bb_mid - (std_dev * data.Close.ewm(span=bb_period).std())
+    # the exponential standard deviation is the expensive part, so compute it once and reuse it for both bands
+    offset = std_dev * data['Close'].ewm(span=bb_period).std().to_numpy()
+    bb_upper = bb_mid + offset
+    bb_lower = bb_mid - offset
 
     # calculate the distance between the upper and lower band to determine if there is incoming volatility
     # the closer together the upper and lower bands are, the more likely volatility will hit soon (up or down)
     # will use a ewma to determine if the difference is above or below normal
-    band_delta = bb_upper - bb_lower
-    delta_ewma = band_delta.ewm(span=bb_period).mean()
+    # (upper - lower is just twice the offset; it stays empty until the middle band has a full window)
+    band_delta = np.where(np.isnan(bb_mid), np.nan, 2 * offset)
+    delta_ewma = _ewm(band_delta, bb_period)
     band_signal = band_delta - delta_ewma
 
     # Create a dataframe that consolidates and generates signal data
     # the signal column of the dataframe will be binary: -1 = currently high volatility, 1 = volatility incoming
 
     bb_df = pd.DataFrame(
-        {'close': data.Close,
-        'middle_band': bb_mid,
-        'upper_band': bb_upper,
-        'lower_band': bb_lower,
-        'band_delta': band_delta,
-        'delta_ewma': delta_ewma,
-        'band_signal': band_signal}
+        np.column_stack([close, bb_mid, bb_upper, bb_lower, band_delta, delta_ewma, band_signal]),
+        index=data.index,
+        columns=['close', 'middle_band', 'upper_band', 'lower_band', 'band_delta', 'delta_ewma', 'band_signal']
     )
 
-    bb_df['signal'] = bb_df.band_signal.apply(lambda x: 1 if x < 0 else -1)
+    bb_df['signal'] = np.where(band_signal < 0, 1, -1).astype(np.int8)
 
     return bb_df
 
@@ -120,22 +257,26 @@ def macd(data, period_slow=26, period_fast=12, period_signal=9):
         *Optionally, takes the fast ewma window size ("period_fast"; default = 12)
         *Optionally, takes signal line window size ("period_signal"; default = 9)
     -Returns a dataframe with 'close', 'slow_ewma', 'fast_ewma', 'macd', 'signal_line', 'con_div', 'macd_signal', 'condiv_signal', and 'signal'
+        *'macd_signal', 'condiv_signal', and 'signal' are int8: -1 (bearish), 0 (neutral; 'signal' only), or 1 (bullish)
     '''
 
     # The Moving Average Convergence/Divergence (MACD) indicator can be broken into three parts: the signal line, the MACD line, and the convergence/divergence between the two
     # THE MACD LINE
     # The MACD line is created by subtracting a slow EMA from a fast EMA.  
         # The defualts are: 26 for slow and 12 for fast.  Adjust to suit your fancy
-    slow_ewma = data.Close.ewm(span=period_slow).mean()
+    close = data['Close'].to_numpy(dtype=np.float64)
 
-    fast_ewma = data.Close.ewm(span=period_fast).mean()
+    # both EWMAs are computed in a single pass over the closing prices
+    ewmas = _ewm_multi(close, (period_slow, period_fast))
+    slow_ewma = ewmas[:, 0]
+    fast_ewma = ewmas[:, 1]
 
     macd = fast_ewma - slow_ewma
 
     # THE SIGNAL LINE
     # The signal line is generated by taking an EWMA of the MACD line.  
         # The default EWMA to use is 9 periods, but adjust as you see fit
-    signal_line = macd.ewm(span=period_signal).mean()
+    signal_line = _ewm(macd, period_signal)
 
     # THE CONVERGENCE/DIVERGENCE
     # The convergence/divergence of the MACD and signal lines is simply the MACD minus the signal.  
@@ -144,29 +285,28 @@ def macd(data, period_slow=26, period_fast=12, period_signal=9):
 
     # build out a dataframe that houses all the MACD signal data
     macd_df = pd.DataFrame(
-        {'close': data.Close,
-        'slow_ewma': slow_ewma,
-        'fast_ewma': fast_ewma,
-        'macd': macd,
-        'signal_line': signal_line,
-        'con_div': condiv}
+        np.column_stack([close, slow_ewma, fast_ewma, macd, signal_line, condiv]),
+        index=data.index,
+        columns=['close', 'slow_ewma', 'fast_ewma', 'macd', 'signal_line', 'con_div']
         )
 
     # add a column that returns a 0 or 1 for the MACD signal.  
         # -1 means the MACD is below the zero line and is bearish.  
         # 1 means the MACD is above the zero line and is bullish.
-    macd_df['macd_signal'] = macd_df['macd'].apply(lambda x: 1 if x > 0 else -1)
+    ms = np.where(macd > 0, 1, -1).astype(np.int8)
+    macd_df['macd_signal'] = ms
 
     # add a column that return a 0 or 1 for the convergence/divergence.  
         # -1 means it is negative and bearish.  
         # 1 means it is positive and bullish. 
-    macd_df['condiv_signal'] = macd_df['con_div'].apply(lambda x: 1 if x > 0 else -1)
+    cs = np.where(condiv > 0, 1, -1).astype(np.int8)
+    macd_df['condiv_signal'] = cs
 
-    # add a column that returns a -1, 0, or 1.  This column is the sum of the previous two.  
+    # add a column that returns a -1, 0, or 1.  This column combines the previous two.  
         # -1 is bearish (all signals are bearish)
         # 0 is neutral (one signal is bullish and one is bearish) 
         # 1 is bullish (all signals are bullish)
-    macd_df['signal'] = (macd_df.macd_signal + macd_df.condiv_signal)/2
+    macd_df['signal'] = np.where((ms == 1) & (cs == 1), 1, np.where((ms == -1) & (cs == -1), -1, 0)).astype(np.int8)
 
     return macd_df
 
@@ -176,178 +316,295 @@ def sma(data, period):
     'Simple Moving Average'
     -Takes in a dataframe with at least one column 'Close' and a datetime index AND a moving average window ("period")
     -Returns a dataframe with 'close', 'sma', 'sma_delta', and 'signal'
+        *'signal' is int8: -1 (bearish) or 1 (bullish)
+    -Raises a ValueError if "period" is not an integer of 1 or greater
     '''
 
     # create the SMA using an input period.  No default period will be provided and user must provide one.
-    sma = data.Close.rolling(window=period).mean()
+    _check_window(period, 'period')
+    close = data['Close'].to_numpy(dtype=np.float64)
+    sma = _sma(close, period)
+    sma_delta = close - sma
 
     # create a dataframe to house the sma signal generator
-    sma_df = pd.DataFrame({
-        'close': data.Close,
-        'sma': sma,
-        'sma_delta': data.Close - sma
-    })
+    sma_df = pd.DataFrame(
+        np.column_stack([close, sma, sma_delta]),
+        index=data.index,
+        columns=['close', 'sma', 'sma_delta']
+    )
 
     # add a column that return -1 or 1: -1 = SMA above the asset price and is bearish, 1 = SMA below the asset price and is bullish
-    sma_df['signal'] = sma_df.sma_delta.apply(lambda x: 1 if x > 0 else -1)
+    sma_df['signal'] = np.where(sma_delta > 0, 1, -1).astype(np.int8)
 
     return sma_df
 
+@njit(cache=True, nogil=True)
+def _wilder(x, period):
+
+    '''
+    "Wilder's Smoothing" used by `rsi`, compiled with numba
+    -Takes a float64 array and the smoothing window ("period")
+    -Returns a float64 array where avg[i] = ((avg[i-1] * (period - 1)) + x[i]) / period, seeded with x[0]
+    '''
+
+    out = np.empty(len(x))
+    if len(x) == 0:
+        return out
+
+    avg = x[0]
+    out[0] = avg
+    for i in range(1, len(x)):
+        avg = ((avg * (period - 1)) + x[i]) / period
+        out[i] = avg
+
+    return out
+
+@njit(cache=True, nogil=True)
+def _rsi_line(gain, loss, period):
+
+    '''
+    RSI line from the gain and (positive) loss arrays, compiled with numba
+    -Takes the gain and loss float64 arrays and Wilder's smoothing window ("period")
+    -Returns a float64 array of RSI values; rows with no price movement yet (and the first row, which has no prior close) are NaN
+    '''
+
+    # smooth both with Wilder's recurrence in a single pass each
+    avg_gain = _wilder(gain, period)
+    avg_loss = _wilder(loss, period)
+
+    # with only gains the epsilon pushes RSI to 100; with no gains and no losses the RSI is undefined
+    rs = avg_gain / np.maximum(avg_loss, 1e-12)
+    rsi = 100 - (100 / (1 + rs))
+    rsi[(avg_gain == 0) & (avg_loss == 0)] = np.nan
+
+    # there is no prior close for the first row, so there is no RSI either
+    if len(rsi) > 0:
+        rsi[0] = np.nan
+
+    return rsi
+
+def _gain_loss(close):
+
+    '''
+    Close-to-close changes split for the RSI, shared by `rsi` and `multi_indicator`
+    -Takes the closing prices as a float64 array
+    -Returns the gain and (positive) loss float64 arrays; the first row has no prior close and counts as 0 in both
+    '''
+
+    close_chg = np.diff(close, prepend=np.nan)
+    gain = np.where(close_chg > 0, close_chg, 0.0)
+    loss = np.where(close_chg < 0, -close_chg, 0.0)
+
+    return gain, loss
+
 def rsi(data, period=14, overbought=70, oversold=30):
 
     '''
     'Relative Strength Index'
     -Takes in a dataframe with at least one column 'Close' and a datetime index
-        *Optionally, it can take exponential moving average window ("period"; default = 14)
+        *Optionally, it can take Wilder's smoothing window ("period"; default = 14)
         *Optionally, it can take overbought value ("overbought"; default = 70)
         *Optionally, it can take oversold value ("oversold"; default = 30)
-    -Returns a dataframe with 'close', 'rsi' and 'signal'
+    -Returns a dataframe with 'Close', 'rsi' and 'signal'
+        *'signal' is int8: -1 (overbought), 0 (neutral), or 1 (oversold)
+    -Raises a ValueError if "period" is less than 1
     '''
 
         # RSI indicator formula:
         # RSI = 100 - [100/(1 + RS)]
         # RS = RS_gain / abs(RS_loss)
-        # RS_gain = {[(average gain from previous period - 1) * 13] + current gain} / 14
-        # RS_loss = {[(average loss from previous period - 1) * 13] + current loss} / 14
+        # RS_gain = {[(average gain from previous period) * 13] + current gain} / 14
+        # RS_loss = {[(average loss from previous period) * 13] + current loss} / 14
     # Default period = 14
 
-    # add a few new columns to the data frame to track the RSI parameters:
-    data['close_chg'] = data['Close'].diff()
-
-    data['gain'] = data.close_chg.apply(lambda x: x if x >= 0 else 0)
-    data['avg_gain'] = data.gain.ewm(span=period).mean()
-    data['prev_avg_gain'] = data.avg_gain.shift()
-    data['rs_gain'] = ((data.prev_avg_gain * (period - 1)) + data.gain) / period
+    # split the close-to-close changes into gains and (positive) losses
+    _check_span(period, 'period')
+    close = data['Close'].to_numpy(dtype=np.float64)
+    gain, loss = _gain_loss(close)
 
-    data['loss'] = data.close_chg.apply(lambda x: x if x < 0 else 0)
-    data['avg_loss'] = data.loss.ewm(span=period).mean()
-    data['prev_avg_loss'] = data.avg_loss.shift()
-    data['rs_loss'] = ((data.prev_avg_loss * (period - 1)) + data.loss) / period
+    # smooth both with Wilder's recurrence and turn them into the RSI line
+    rsi = _rsi_line(gain, loss, period)
 
-    data['rs'] = data.rs_gain / abs(data.rs_loss)
-    data['rsi'] = 100 - (100 / (1 + data.rs))
-
-    data = data[['Close', 'rsi']]
+    data = pd.DataFrame({'Close': close, 'rsi': rsi}, index=data.index)
 
     # add a signal column that will help identify the most basic trend
     # -1 means the RSI is over the overbought value and considered bearish potential (default = 70)
     # 0 means the RSI is between the overbought and the oversold values and considered neutral
     # 1 means the RSI is below the oversold value and considered bullish potential (defualt = 30)
     
-    # create a sub-function that will determine if the RSI is overbought, oversold or neutral
-    def rsi_level(x):
-        if x >= overbought:
-            return -1
-        elif overbought > x > oversold:
-            return 0
-        elif x <= oversold:
-            return 1
-
-    # using the rsi_level function above, add a new column to the dataframe that returns the signal
-    data['signal'] = data.rsi.apply(lambda x: rsi_level(x))
+    # classify every RSI reading as overbought, oversold or neutral in a single vectorized pass
+    data['signal'] = np.select([rsi >= overbought, rsi <= oversold], [-1, 1], default=0).astype(np.int8)
     return data
 
-def psar(data, af_start=0.02, af_step=0.02, af_max=0.20):
+@njit(cache=True)
+def _psar_core(high, low, close, af_start, af_step, af_max):
 
     '''
-    'Parabolic Stop and Reverse'
-    -Takes in a dataframe with at least the following columns included: 'Close', 'High', and 'Low'
-        *Optionally, takes the acceleration factor starting point ("af_start"; default = 0.02)
-        *Optionally, takes the acceleration factor step size ("af_step"; default = 0.02)
-        *Optionally, takes the acceleration factor maximum value ("af_max"; default = 0.20)
-    -Returns 'af', 'trend', 'trend_high', 'trend_low', 'ep', 'psar_init', 'psar_final', and 'signal' appended to the original dataframe
+    Bar-by-bar PSAR recurrence used by `psar`, compiled with numba
+    -Takes the 'High', 'Low', and 'Close' columns as float64 arrays and the acceleration factor parameters
+    -Returns the 'af', 'trend', 'trend_high', 'trend_low', 'ep', 'psar_init', 'psar_final', and 'signal' arrays
     '''
 
-    # set your initial values (there will be no PSAR for the very first point in a dataset since there is no prior PSAR)
-    # AF_start = 0.02 by default, AF_step = 0.02 by default, AF_max = 0.20 by defualt
-    # Trend = close[0] - close[1].  If trend > 0, then the trend is 'down', else it is 'up'
-    # EP:
-        # if trend is 'up', EP = low[0]
-        # if trend is 'down', EP = high[0]
-    # PSAR_init and PSAR_final are equal:
-        # if trend is 'up', PSAR_init = high[0]
-        # if trend is 'down', PSAR_init = low[0]    
-
-    data['af'] = af_start
-    data['trend'] = 0 if data.Close[0] - data.Close[1] > 0 else 1
-    data['trend_high'] = data.High[0]
-    data['trend_low'] = data.Low[0]
-    data['ep'] = data.High[0] if data.trend[1] == 1 else data.Low[0]
-    data['psar_init'] = data.High[0] if data.trend[1] == 0 else data.Low[0]
-    data['psar_final'] = data['psar_init']
-    data['signal'] = -1 if data.trend[0] == 0 else 1
-
-    # loop through the whole dataframe
-    for iloc in range(1, len(data)):
+    n = len(close)
+
+    # the seeding below writes index 0 and reads the first two closes, which numba does not bounds-check
+    if n < 2:
+        raise ValueError('PSAR needs at least two candles to set the initial trend.')
+
+    # allocate the outputs once; only the first candle is seeded here (see `psar` for the definitions), the loop fills the rest
+    af = np.empty(n)
+    trend = np.empty(n, dtype=np.int8)
+    trend_high = np.empty(n)
+    trend_low = np.empty(n)
+    ep = np.empty(n)
+    psar_init = np.empty(n)
+    psar_final = np.empty(n)
+    signal = np.empty(n, dtype=np.int8)
+
+    init_trend = 0 if close[0] - close[1] > 0 else 1
+    af[0] = af_start
+    trend[0] = init_trend
+    trend_high[0] = high[0]
+    trend_low[0] = low[0]
+    ep[0] = high[0] if init_trend == 1 else low[0]
+    psar_init[0] = high[0] if init_trend == 0 else low[0]
+    psar_final[0] = psar_init[0]
+    signal[0] = -1 if init_trend == 0 else 1
+
+    # carry the previous candle's values as scalars instead of re-reading the arrays
+    prev_af = af[0]
+    prev_trend = trend[0]
+    prev_th = trend_high[0]
+    prev_tl = trend_low[0]
+    prev_ep = ep[0]
+    prev_psar = psar_final[0]
+
+    # loop through the whole dataset
+    for i in range(1, n):
 
         # If the previous trend was DOWN set the initial current trend to 0 and perform the down trend PSAR Calculations:
-        if data.trend.iloc[iloc-1] == 0:
-            data.trend.iloc[iloc] = 0
+        if prev_trend == 0:
+            cur_trend = 0
 
             # 1) Initial PSAR = Previous PSAR - (Previous AF * (Previous PSAR - Previous EP))
-            data.psar_init.iloc[iloc] = data.psar_final.iloc[iloc-1] - (data.af.iloc[iloc-1] * (data.psar_final.iloc[iloc-1] - data.ep.iloc[iloc-1]))
-            # 2) If the dataframe positional ('iloc' from the loop above) is at the 3rd position or higher, the initial PSAR is the GREATER of the intial PSAR calculated in step 1 or the highest of the previous two candles.  Otherwise, it is the GREATER of the initial PSAR calculated in step 1 or the previous candle's high.
-            if iloc < 1:
-                data.psar_init.iloc[iloc] = max(data.psar_init.iloc[iloc], data.High.iloc[iloc-1])
+            cur_psar_init = prev_psar - (prev_af * (prev_psar - prev_ep))
+            # 2) If the positional index is at the 3rd position or higher, the initial PSAR is the GREATER of the intial PSAR calculated in step 1 or the highest of the previous two candles.  Otherwise, it is the GREATER of the initial PSAR calculated in step 1 or the previous candle's high.
+            if i < 2:
+                cur_psar_init = max(cur_psar_init, high[i-1])
             else:
-                data.psar_init.iloc[iloc] = max(data.psar_init.iloc[iloc], data.High.iloc[iloc-1], data.High.iloc[iloc-2])
+                cur_psar_init = max(cur_psar_init, high[i-1], high[i-2])
             # 3) If the current Low is is LESS THAN the previous EP, then the current EP == current Low, otherwise the the current EP == previous EP
-            data.ep.iloc[iloc] = data.ep.iloc[iloc-1] if data.ep.iloc[iloc-1] < data.Low.iloc[iloc] else data.Low.iloc[iloc]
+            cur_ep = prev_ep if prev_ep < low[i] else low[i]
             # 4) If the current EP is updated to the current low, then the AF needs to be increased by the `af_step`, otherwise current AF == previous AF
-            if data.ep.iloc[iloc] == data.Low.iloc[iloc]:
-                data.af.iloc[iloc] = (data.af.iloc[iloc-1] + af_step) if data.af.iloc[iloc-1] < af_max else af_max
+            if cur_ep == low[i]:
+                cur_af = (prev_af + af_step) if prev_af < af_max else af_max
             else:
-                data.af.iloc[iloc] = data.af.iloc[iloc-1]
+                cur_af = prev_af
             # 5) Update the low and high for the current trend, if necessary
-            data.trend_low.iloc[iloc] = data.Low.iloc[iloc] if data.trend_low.iloc[iloc-1] > data.Low.iloc[iloc] else data.trend_low.iloc[iloc-1]
-            data.trend_high.iloc[iloc] = data.High.iloc[iloc] if data.trend_high.iloc[iloc-1] < data.High.iloc[iloc] else data.trend_high.iloc[iloc-1]
+            cur_tl = low[i] if prev_tl > low[i] else prev_tl
+            cur_th = high[i] if prev_th < high[i] else prev_th
             #6) If the initial PSAR is GREATER THAN the current High, the psar_final == psar_intial, otherwise the trend flips and the parameters reset -- trend == 1, PSAR == EP, EP == current High, AF == af_start, and trend_high and trend_low reset
-            if data.psar_init.iloc[iloc] > data.High.iloc[iloc]:
-                data.psar_final.iloc[iloc] = data.psar_init.iloc[iloc]
+            if cur_psar_init > high[i]:
+                cur_psar_final = cur_psar_init
             else:
-                data.trend.iloc[iloc] = 1
-                data.psar_final.iloc[iloc] = data.ep.iloc[iloc]
-                data.af.iloc[iloc] = af_start
-                data.ep.iloc[iloc] = data.High.iloc[iloc]
-                data.trend_high.iloc[iloc] = data.High.iloc[iloc]
-                data.trend_low.iloc[iloc] = data.Low.iloc[iloc]
+                cur_trend = 1
+                cur_psar_final = cur_ep
+                cur_af = af_start
+                cur_ep = high[i]
+                cur_th = high[i]
+                cur_tl = low[i]
 
         # If the previous trend was UP set the initial current trend to 1 and perform the up trend PSAR Calculations:
         else:
-            data.trend.iloc[iloc] = 1
+            cur_trend = 1
 
             # 1) Initial PSAR = Previous PSAR + (Previous AF * (Previous EP - Previous PSAR))
-            data.psar_init.iloc[iloc] = data.psar_final.iloc[iloc-1] + (data.af.iloc[iloc-1] * (data.ep.iloc[iloc-1] - data.psar_final.iloc[iloc-1]))
-            # 2) If the dataframe positional ('iloc' from the loop above) is at the 3rd position or higher, the initial PSAR is the LEAST of the intial PSAR calculated in step 1 or the lowest of the previous two candles.  Otherwise, it is the LEAST of the initial PSAR calculated in step 1 or the previous candle's low.
-            if iloc < 2:
-                data.psar_init.iloc[iloc] = min(data.psar_init.iloc[iloc], data.Low.iloc[iloc-1])
+            cur_psar_init = prev_psar + (prev_af * (prev_ep - prev_psar))
+            # 2) If the positional index is at the 3rd position or higher, the initial PSAR is the LEAST of the intial PSAR calculated in step 1 or the lowest of the previous two candles.  Otherwise, it is the LEAST of the initial PSAR calculated in step 1 or the previous candle's low.
+            if i < 2:
+                cur_psar_init = min(cur_psar_init, low[i-1])
             else:
-                data.psar_init.iloc[iloc] = min(data.psar_init.iloc[iloc], data.Low.iloc[iloc-1], data.Low.iloc[iloc-2])
+                cur_psar_init = min(cur_psar_init, low[i-1], low[i-2])
             # 3) If the current High is is GREATER THAN the previous EP, then the current EP == current High, otherwise the the current EP == previous EP
-            data.ep.iloc[iloc] = data.ep.iloc[iloc-1] if data.ep.iloc[iloc-1] > data.High.iloc[iloc] else data.High.iloc[iloc]
+            cur_ep = prev_ep if prev_ep > high[i] else high[i]
             # 4) If the current EP is updated to the current High, then the AF needs to be increased by the `af_step`, otherwise current AF == previous AF
-            if data.ep.iloc[iloc] == data.High.iloc[iloc]:
-                data.af.iloc[iloc] = (data.af.iloc[iloc-1] + af_step) if data.af.iloc[iloc-1] < af_max else af_max
+            if cur_ep == high[i]:
+                cur_af = (prev_af + af_step) if prev_af < af_max else af_max
             else:
-                data.af.iloc[iloc] = data.af.iloc[iloc-1]
+                cur_af = prev_af
             # 5) Update the low and high for the current trend, if necessary
-            data.trend_low.iloc[iloc] = data.Low.iloc[iloc] if data.trend_low.iloc[iloc-1] > data.Low.iloc[iloc] else data.trend_low.iloc[iloc-1]
-            data.trend_high.iloc[iloc] = data.High.iloc[iloc] if data.trend_high.iloc[iloc-1] < data.High.iloc[iloc] else data.trend_high.iloc[iloc-1]
+            cur_tl = low[i] if prev_tl > low[i] else prev_tl
+            cur_th = high[i] if prev_th < high[i] else prev_th
             #6) If the initial PSAR is LESS THAN the current Low, the psar_final == psar_intial, otherwise the trend flips and the parameters reset -- trend == 0, PSAR == EP, EP == current Low, AF == af_start, and trend_high and trend_low reset
-            if data.psar_init.iloc[iloc] < data.Low.iloc[iloc]:
-                data.psar_final.iloc[iloc] = data.psar_init.iloc[iloc]
+            if cur_psar_init < low[i]:
+                cur_psar_final = cur_psar_init
             else:
-                data.trend.iloc[iloc] = 0
-                data.psar_final.iloc[iloc] = data.ep.iloc[iloc-1]
-                data.af.iloc[iloc] = af_start
-                data.ep.iloc[iloc] = data.Low.iloc[iloc]
-                data.trend_high.iloc[iloc] = data.High.iloc[iloc]
-                data.trend_low.iloc[iloc] = data.Low.iloc[iloc]
-        
-        if data.trend.iloc[iloc] == 0:
-            data['signal'].iloc[iloc] = -1
-        else:
-            data['signal'].iloc[iloc] = 1
+                cur_trend = 0
+                cur_psar_final = prev_ep
+                cur_af = af_start
+                cur_ep = low[i]
+                cur_th = high[i]
+                cur_tl = low[i]
+
+        af[i] = cur_af
+        trend[i] = cur_trend
+        trend_high[i] = cur_th
+        trend_low[i] = cur_tl
+        ep[i] = cur_ep
+        psar_init[i] = cur_psar_init
+        psar_final[i] = cur_psar_final
+        signal[i] = -1 if cur_trend == 0 else 1
+
+        prev_af = cur_af
+        prev_trend = cur_trend
+        prev_th = cur_th
+        prev_tl = cur_tl
+        prev_ep = cur_ep
+        prev_psar = cur_psar_final
+
+    return af, trend, trend_high, trend_low, ep, psar_init, psar_final, signal
+
+def psar(data, af_start=0.02, af_step=0.02, af_max=0.20):
+
+    '''
+    'Parabolic Stop and Reverse'
+    -Takes in a dataframe with at least the following columns included: 'Close', 'High', and 'Low'
+        *Optionally, takes the acceleration factor starting point ("af_start"; default = 0.02)
+        *Optionally, takes the acceleration factor step size ("af_step"; default = 0.02)
+        *Optionally, takes the acceleration factor maximum value ("af_max"; default = 0.20)
+    -Returns 'af', 'trend', 'trend_high', 'trend_low', 'ep', 'psar_init', 'psar_final', and 'signal' appended to the original dataframe
+        *'trend' and 'signal' are int8: 'trend' is 0 (down) or 1 (up), 'signal' is -1 (bearish) or 1 (bullish)
+    -Raises a ValueError if the dataframe has fewer than two rows
+    '''
+
+    # set your initial values (there will be no PSAR for the very first point in a dataset since there is no prior PSAR)
+    # AF_start = 0.02 by default, AF_step = 0.02 by default, AF_max = 0.20 by defualt
+    # Trend = close[0] - close[1].  If trend > 0, then the trend is 'down', else it is 'up'
+    # EP:
+        # if trend is 'up', EP = low[0]
+        # if trend is 'down', EP = high[0]
+    # PSAR_init and PSAR_final are equal:
+        # if trend is 'up', PSAR_init = high[0]
+        # if trend is 'down', PSAR_init = low[0]    
+
+    # the bar-by-bar calculation runs in the compiled `_psar_core` on plain numpy arrays (it raises the ValueError for fewer than two candles)
+    af, trend, trend_high, trend_low, ep, psar_init, psar_final, signal = _psar_core(
+        data['High'].to_numpy(dtype=np.float64),
+        data['Low'].to_numpy(dtype=np.float64),
+        data['Close'].to_numpy(dtype=np.float64),
+        float(af_start),
+        float(af_step),
+        float(af_max)
+        )
+
+    data['af'] = af
+    data['trend'] = trend
+    data['trend_high'] = trend_high
+    data['trend_low'] = trend_low
+    data['ep'] = ep
+    data['psar_init'] = psar_init
+    data['psar_final'] = psar_final
+    data['signal'] = signal
 
     return data
 
@@ -356,27 +613,96 @@ def vwap(data):
     '''
     'Volume Weighted Average Price'
     -Takes in a dataframe with at least the following columns included: 'Close', 'High', 'Low', and 'Volume'
-    -Returns 'avg_price', 'current_day', 'prev_day', 'daily_cum_vol', 'vwap' and 'signal' added to the original dataframe
+    -Returns 'avg_price', 'daily_cum_vol', 'vwap' and 'signal' added to the original dataframe
+        *'signal' is int8: 1 when the VWAP is above the close, otherwise 0
     '''
 
     # VWAP = volume weighted average price
-    # VWAP = sumS(volume) * sum(avg. price) / sum(volume)
+    # VWAP = sum(volume * avg. price) / sum(volume)
         # avg price = (high + close + low) / 3
         # the volume and price is a running cumulative for the DAY (restarts everyday)
             # Since it restarts everyday, this is not a great tool on the daily timeframe and above (on the daily timeframe, VWAP is just equal to the avg price), so it is better to use this tool only on *INTRADAY* time frames.  
 
     data['avg_price'] = (data.Close + data.High + data.Low) / 3
-    data['curent_day'] = data.index.weekday
-    data['prev_day'] = data.curent_day.shift()
-    data['daily_cum_vol'] = data.Volume
 
-    for day in range(1, len(data)):
-        if data.curent_day.iloc[day] == data.prev_day.iloc[day]:
-            data['daily_cum_vol'].iloc[day] += data.Volume.iloc[day]
-        else:
-            data['daily_cum_vol'].iloc[day] = data.Volume.iloc[day]
+    # group the rows by calendar day so the running sums restart every day
+    day_id = data.index.normalize()
+    cum_pv = (data['Volume'] * data['avg_price']).groupby(day_id).cumsum()
+    data['daily_cum_vol'] = data['Volume'].groupby(day_id).cumsum()
 
-    data['vwap'] = (data.daily_cum_vol * data.avg_price) / data.daily_cum_vol
-    data.signal = np.where(data.vwap > data.Close, 1, 0)
+    data['vwap'] = cum_pv / data['daily_cum_vol']
+    data['signal'] = np.where(data['vwap'].to_numpy() > data['Close'].to_numpy(), 1, 0).astype(np.int8)
     return data
 
+@njit(cache=True, parallel=True)
+def _multi_core(close, gain, loss, ewma_periods, sma_periods, rsi_periods):
+
+    '''
+    Parallel driver for `multi_indicator`, compiled with numba
+    -Takes the close, gain and loss float64 arrays and one array of windows per indicator type
+    -Returns a 2D float64 array with one row per requested line (EWMAs first, then SMAs, then RSIs)
+    '''
+
+    n_ewma = len(ewma_periods)
+    n_sma = len(sma_periods)
+    n_rsi = len(rsi_periods)
+    out = np.empty((n_ewma + n_sma + n_rsi, len(close)))
+
+    # every line is an independent pass over the same input, so each one gets its own thread
+    for k in prange(n_ewma + n_sma + n_rsi):
+        if k < n_ewma:
+            out[k] = _ewm_mean(close, 2 / (ewma_periods[k] + 1))
+        elif k < n_ewma + n_sma:
+            out[k] = _sma(close, sma_periods[k - n_ewma])
+        else:
+            out[k] = _rsi_line(gain, loss, rsi_periods[k - n_ewma - n_sma])
+
+    return out
+
+def multi_indicator(data, ewma_periods=(9, 13), sma_periods=(20,), rsi_periods=(14,)):
+
+    '''
+    'Multiple Indicator Lines'
+    -Takes in a dataframe with at least one column 'Close' and a datetime index
+        *Optionally, takes the EWMA windows to compute ("ewma_periods"; default = (9, 13))
+        *Optionally, takes the SMA windows to compute ("sma_periods"; default = (20,))
+        *Optionally, takes the RSI smoothing windows to compute ("rsi_periods"; default = (14,))
+    -Returns a dataframe with 'close' and one column per requested line, named 'ewma_<period>', 'sma_<period>', and 'rsi_<period>'
+    -Raises a ValueError if a period is invalid (see `ewma`, `sma`, and `rsi`) or repeated within the same tuple
+    '''
+
+    # validate every period up front, since the compiled kernels do not bounds-check their inputs
+    for name, periods, check in (
+        ('ewma_periods', ewma_periods, _check_span),
+        ('sma_periods', sma_periods, _check_window),
+        ('rsi_periods', rsi_periods, _check_span)
+        ):
+        for period in periods:
+            check(period, name)
+        # repeated periods would produce duplicate column names
+        if len(set(periods)) != len(periods):
+            raise ValueError(f'{name} contains repeated periods: {tuple(periods)!r}')
+
+    # the lines match the 'ewma', 'sma', and 'rsi' columns of `ewma`, `sma`, and `rsi`, but are all computed in parallel in one call
+    close = data['Close'].to_numpy(dtype=np.float64)
+    gain, loss = _gain_loss(close)
+
+    lines = _multi_core(
+        close,
+        gain,
+        loss,
+        np.asarray(ewma_periods, dtype=np.float64),
+        np.asarray(sma_periods, dtype=np.int64),
+        np.asarray(rsi_periods, dtype=np.float64)
+        )
+
+    columns = (
+        [f'ewma_{period}' for period in ewma_periods]
+        + [f'sma_{period}' for period in sma_periods]
+        + [f'rsi_{period}' for period in rsi_periods]
+        )
+
+    multi_df = pd.DataFrame(lines.T, index=data.index, columns=columns)
+    multi_df.insert(0, 'close', close)
+
+    return multi_df